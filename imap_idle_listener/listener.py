@@ -1,15 +1,57 @@
 import asyncio
 import logging
-from collections.abc import Callable
+import re
+from collections.abc import Awaitable, Callable, Iterator
 from email.message import Message
 from email.parser import BytesParser
-from email.policy import default as default_policy
+from email.policy import compat32
 from typing import Any, Coroutine
 
 from aioimaplib import aioimaplib
 
 from .exceptions import IMAPAuthError, IMAPConnectionError, IMAPIDLEError
 
+# aioimaplib.Abort is left out: it also signals permanent failures such as a
+# missing IDLE capability or a command that is illegal in the current state.
+_RECONNECT_ERRORS = (
+    IMAPConnectionError,
+    ConnectionError,
+    asyncio.IncompleteReadError,
+    asyncio.TimeoutError,
+    aioimaplib.CommandTimeout,
+)
+_MAX_RECONNECT_DELAY = 60
+# Emails larger than this are parsed in a worker thread. The email package is
+# pure Python, so the event loop still gets GIL time while the parse runs.
+_THREAD_PARSE_THRESHOLD = 64 * 1024
+
+# Bounds the FETCH command line and the number of bodies held in memory at once.
+_FETCH_BATCH_SIZE = 50
+
+_FETCH_RE = re.compile(rb"^(\d+) FETCH \(")
+
+
+def _batched(items: list[str], size: int) -> Iterator[list[str]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _fetch_bodies(lines: list) -> dict[str, bytes]:
+    """Map each message number in a BODY[] FETCH response to its literal."""
+    bodies = {}
+    email_id = None
+    for line in lines:
+        # aioimaplib hands literals back as bytearray and protocol lines as bytes.
+        if isinstance(line, bytearray):
+            if email_id is not None:
+                bodies[email_id] = line
+                email_id = None
+            continue
+        match = _FETCH_RE.match(line)
+        if match:
+            email_id = match.group(1).decode()
+    return bodies
+
 
 class IMAPIdleListener:
     """
@@ -24,8 +66,18 @@ class IMAPIdleListener:
         username (str): Email address for authentication.
         password (str): Password for authentication.
         mailbox (str): Mailbox to monitor (default: "INBOX").
-        idle_timeout (int): Timeout for IDLE mode in seconds (default: 15 minutes).
-        email_processors (list): List of functions or coroutines to process emails.
+        idle_timeout (int): Timeout for IDLE mode in seconds (default: 10 minutes).
+            RFC 2177 allows up to 29 minutes, but many servers silently drop
+            idle connections well before that.
+        policy (Policy): Policy used to parse emails (default: compat32). Pass
+            ``email.policy.default`` if processors need structured headers or
+            the EmailMessage API.
+        email_filter (callable): Optional predicate on the raw email bytes. Emails
+            it rejects are skipped before MIME parsing (default: None).
+        email_processors (tuple): Tuple of (processor, is_coroutine) pairs, where
+            each processor is a function or coroutine to process emails.
+        raw_email_processors (tuple): Like ``email_processors``, but each processor
+            receives the raw email bytes and runs before MIME parsing.
 
     """
 
@@ -36,8 +88,11 @@ class IMAPIdleListener:
         username,
         password,
         mailbox="INBOX",
-        idle_timeout=15 * 60,
+        idle_timeout=10 * 60,
         email_processors=None,
+        policy=compat32,
+        email_filter=None,
+        raw_email_processors=None,
     ):
         self.host = host
         self.port = port
@@ -45,22 +100,32 @@ class IMAPIdleListener:
         self.password = password
         self.mailbox = mailbox
         self.idle_timeout = idle_timeout
+        self.policy = policy
+        self.email_filter: Callable[[bytes], bool] | None = email_filter
         self.client: aioimaplib.IMAP4_SSL | None = None
         self._stop_event = asyncio.Event()
+        self._pending: asyncio.Task | None = None
         self.logger = logging.getLogger(__name__)
-        self.email_processors = email_processors if email_processors is not None else []
+        self.email_processors = tuple(
+            (processor, asyncio.iscoroutinefunction(processor))
+            for processor in email_processors or ()
+        )
+        self.raw_email_processors = tuple(
+            (processor, asyncio.iscoroutinefunction(processor))
+            for processor in raw_email_processors or ()
+        )
 
     async def connect(self) -> bool:
         try:
             self.client = aioimaplib.IMAP4_SSL(host=self.host, port=self.port)
             await self.client.wait_hello_from_server()
 
-            self.logger.info(f"Logging in to {self.username}")
+            self.logger.info("Logging in to %s", self.username)
             response = await self.client.login(self.username, self.password)
             if response.result != "OK":
                 raise IMAPAuthError(f"Login failed: {response.result}")
 
-            self.logger.info(f"Selecting mailbox {self.mailbox}")
+            self.logger.info("Selecting mailbox %s", self.mailbox)
             response = await self.client.select(self.mailbox)
             if response.result != "OK":
                 raise IMAPConnectionError(
@@ -68,45 +133,153 @@ class IMAPIdleListener:
                 )
 
             return True
+        except IMAPAuthError as e:
+            self.logger.error("Authentication error: %s", e)
+            raise
         except Exception as e:
-            self.logger.error(f"Connection error: {e}", exc_info=True)
+            self.logger.error("Connection error: %s", e, exc_info=True)
             raise IMAPConnectionError(f"Connection failed: {e}")
 
+    def _require_client(self) -> aioimaplib.IMAP4_SSL:
+        if self.client is None:
+            raise IMAPConnectionError("Client is not connected")
+        return self.client
+
     async def fetch_new_emails(self) -> None:
-        assert self.client is not None, "Client is not connected"
+        await self._fetch_unseen(self._require_client(), self.handle_emails)
+
+    async def _fetch_unseen(
+        self,
+        client: aioimaplib.IMAP4_SSL,
+        handle: Callable[[dict[str, bytes]], Awaitable[None]],
+    ) -> None:
+        email_ids = await self._search_unseen_emails(client)
+        for batch in _batched(email_ids, _FETCH_BATCH_SIZE):
+            await handle(await self._fetch_emails(client, batch))
+
+    async def _search_unseen_emails(self, client: aioimaplib.IMAP4_SSL) -> list[str]:
         self.logger.info("Checking for new emails...")
-        response = await self.client.search("UNSEEN")
+        response = await client.search("UNSEEN")
         if response.result == "OK":
-            email_ids = response.lines[0].split()
-            if email_ids:
-                self.logger.info(f"Found {len(email_ids)} new email(s)")
-                for email_id in email_ids:
-                    await self.process_email(email_id.decode())
+            if response.lines and response.lines[0]:
+                email_ids = response.lines[0].decode().split()
+                self.logger.info("Found %d new email(s)", len(email_ids))
+                return email_ids
             else:
                 self.logger.debug("No new emails found")
+        return []
+
+    async def _fetch_emails(
+        self, client: aioimaplib.IMAP4_SSL, email_ids: list[str]
+    ) -> dict[str, bytes]:
+        """
+        Fetch several emails in a single FETCH command.
+
+        Emails missing from the batched response are fetched one by one.
+
+        Args:
+            client: Connected client to issue the FETCH on.
+            email_ids: Message sequence numbers to fetch.
+
+        Returns:
+            A mapping of message sequence number to raw RFC 822 bytes.
+        """
+        response = await client.fetch(",".join(email_ids), "(BODY[])")
+        bodies = _fetch_bodies(response.lines) if response.result == "OK" else {}
+
+        raw_emails = {}
+        for email_id in email_ids:
+            if email_id in bodies:
+                raw_emails[email_id] = bodies[email_id]
+                continue
+
+            self.logger.debug("Email %s missing from batch, fetching alone", email_id)
+            raw_email = await self._fetch_email(client, email_id)
+            if raw_email is not None:
+                raw_emails[email_id] = raw_email
+        return raw_emails
+
+    async def _fetch_email(
+        self, client: aioimaplib.IMAP4_SSL, email_id: str
+    ) -> bytes | None:
+        response = await client.fetch(email_id, "(BODY[])")
+        if response.result != "OK":
+            self.logger.error("Failed to fetch email %s", email_id)
+            return None
+
+        raw_email = _fetch_bodies(response.lines).get(email_id)
+        if raw_email is None:
+            self.logger.error("Malformed FETCH response for email %s", email_id)
+        return raw_email
 
     async def process_email(self, email_id: str) -> None:
-        assert self.client is not None, "Client is not connected"
+        """
+        Fetch and process a single email by sequence number.
+
+        Kept for compatibility; the listener itself fetches in batches.
+
+        Args:
+            email_id: Message sequence number of the email.
+        """
+        client = self._require_client()
         try:
-            response = await self.client.fetch(email_id, "(BODY[])")
-            if response.result != "OK":
-                self.logger.error(f"Failed to fetch email {email_id}")
+            raw_email = await self._fetch_email(client, email_id)
+        except Exception as e:
+            self.logger.error(
+                "Error fetching email %s: %s",
+                email_id,
+                e,
+                exc_info=self.logger.isEnabledFor(logging.DEBUG),
+            )
+            return
+
+        if raw_email is not None:
+            await self.handle_email(email_id, raw_email)
+
+    async def handle_emails(self, raw_emails: dict[str, bytes]) -> None:
+        for email_id, raw_email in raw_emails.items():
+            await self.handle_email(email_id, raw_email)
+
+    async def handle_email(self, email_id: str, raw_email: bytes) -> None:
+        try:
+            if self.email_filter is not None and not self.email_filter(raw_email):
+                self.logger.debug("Skipping email %s rejected by filter", email_id)
                 return
 
-            raw_email = response.lines[1]
-            email_message = BytesParser(policy=default_policy).parsebytes(raw_email)  # type: ignore
+            for processor, is_coroutine in self.raw_email_processors:
+                if is_coroutine:
+                    handled = await processor(raw_email, self)
+                else:
+                    handled = processor(raw_email, self)
+                if handled:
+                    self.logger.info("Processed email %s from raw bytes", email_id)
+                    return
+
+            if not self.email_processors:
+                return
+
+            parser = BytesParser(policy=self.policy)
+            if len(raw_email) > _THREAD_PARSE_THRESHOLD:
+                email_message = await asyncio.to_thread(parser.parsebytes, raw_email)  # type: ignore
+            else:
+                email_message = parser.parsebytes(raw_email)  # type: ignore
             self.logger.info(
-                f"Processing email {email_id} - Subject: {email_message['subject']}"
+                "Processing email %s - Subject: %s", email_id, email_message["subject"]
             )
 
-            for processor in self.email_processors:
-                if asyncio.iscoroutinefunction(processor):
+            for processor, is_coroutine in self.email_processors:
+                if is_coroutine:
                     await processor(email_message, self)
                 else:
                     processor(email_message, self)
 
         except Exception as e:
-            self.logger.error(f"Error processing email {email_id}: {e}", exc_info=True)
+            self.logger.error(
+                "Error processing email %s: %s",
+                email_id,
+                e,
+                exc_info=self.logger.isEnabledFor(logging.DEBUG),
+            )
 
     def add_email_processor(
         self,
@@ -116,42 +289,140 @@ class IMAPIdleListener:
         """
         Add a custom email processor.
 
+        Processors run in the background while the listener is back in IDLE
+        mode, so they must not issue IMAP commands through ``listener.client``.
+
         Args:
             processor: A function or coroutine to process emails.
         """
-        self.email_processors.append(processor)
+        self.email_processors = (
+            *self.email_processors,
+            (processor, asyncio.iscoroutinefunction(processor)),
+        )
 
-    async def start_idle(self) -> None:
-        assert self.client is not None, "Client is not connected"
+    def add_raw_email_processor(
+        self,
+        processor: Callable[[bytes, "IMAPIdleListener"], bool | None]
+        | Callable[[bytes, "IMAPIdleListener"], Coroutine[Any, Any, bool | None]],
+    ) -> None:
+        """
+        Add a processor that works on the raw email bytes.
+
+        Raw processors run in registration order before the email is parsed.
+        If one returns a truthy value, the email is considered handled and
+        neither MIME parsing nor the regular email processors run for it.
+
+        Args:
+            processor: A function or coroutine to process raw emails.
+        """
+        self.raw_email_processors = (
+            *self.raw_email_processors,
+            (processor, asyncio.iscoroutinefunction(processor)),
+        )
 
+    async def start_idle(self) -> None:
         self.logger.info("Starting IDLE mode")
+        backoff = 1
+        while not self._stop_event.is_set():
+            try:
+                await self._idle_once()
+                backoff = 1
+            except _RECONNECT_ERRORS as e:
+                self.logger.warning(
+                    "Lost IDLE connection: %s, reconnecting in %ds", e, backoff
+                )
+                await self._reconnect(backoff)
+                backoff = min(backoff * 2, _MAX_RECONNECT_DELAY)
+            except Exception as e:
+                self.logger.error("Error in IDLE mode: %s", e, exc_info=True)
+                raise IMAPIDLEError(f"IDLE mode failed: {e}")
+
+    async def _idle_once(self) -> None:
+        client = self._require_client()
+
+        await self._wait_pending()
+
+        await self._fetch_unseen(client, self._handle_in_background)
+
+        self.logger.debug("Entering IDLE mode")
+        idle_task = await client.idle_start()
+
         try:
-            while not self._stop_event.is_set():
-                await self.fetch_new_emails()
+            await client.wait_server_push(timeout=self.idle_timeout)
+        except asyncio.TimeoutError:
+            self.logger.debug("IDLE timeout, checking for new emails")
+        finally:
+            client.idle_done()
+            await asyncio.wait_for(idle_task, timeout=10)
 
-                self.logger.debug("Entering IDLE mode")
-                idle_task = await self.client.idle_start()
+    async def _handle_in_background(self, raw_emails: dict[str, bytes]) -> None:
+        # Keep at most one batch being processed while the next is fetched.
+        await self._wait_pending()
+        self._pending = asyncio.create_task(self.handle_emails(raw_emails))
 
-                try:
-                    await self.client.wait_server_push(timeout=self.idle_timeout)
-                except asyncio.TimeoutError:
-                    self.logger.debug("IDLE timeout, checking for new emails")
-                finally:
-                    self.client.idle_done()
-                    await asyncio.wait_for(idle_task, timeout=10)
+    async def _wait_pending(self) -> None:
+        if self._pending is not None:
+            try:
+                await self._pending
+            finally:
+                self._pending = None
+
+    async def _reconnect(self, delay: float) -> None:
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+            return
+        except asyncio.TimeoutError:
+            pass
 
+        if self.client is not None:
+            await self._discard_client(self.client)
+            self.client = None
+
+        try:
+            await self.connect()
+        except IMAPAuthError:
+            # Retrying a rejected login only risks locking the account.
+            if self.client is not None:
+                await self._discard_client(self.client)
+            self.client = None
+            raise
+        except IMAPConnectionError:
+            # Already logged by connect(); the next cycle retries with a longer delay.
+            if self.client is not None:
+                await self._discard_client(self.client)
+            self.client = None
+            return
+
+        if self._stop_event.is_set() and self.client is not None:
+            # stop() ran while connecting and never saw the new client.
+            await self._discard_client(self.client)
+            self.client = None
+
+    async def _discard_client(self, client: aioimaplib.IMAP4_SSL) -> None:
+        try:
+            await client.logout()
         except Exception as e:
-            self.logger.error(f"Error in IDLE mode: {e}", exc_info=True)
-            raise IMAPIDLEError(f"IDLE mode failed: {e}")
+            self.logger.debug("Error during logout of stale client: %s", e)
+        # logout() cannot close a dead socket, so drop the transport explicitly.
+        protocol = getattr(client, "protocol", None)
+        transport = getattr(protocol, "transport", None)
+        if transport is not None:
+            transport.close()
 
     async def stop(self) -> None:
-        assert self.client is not None, "Client is not connected"
         self.logger.info("Stopping IDLE listener")
         self._stop_event.set()
+        if self._pending is not None:
+            try:
+                await asyncio.shield(self._pending)
+            except Exception as e:
+                self.logger.error("Error in pending email processing: %s", e)
+            finally:
+                self._pending = None
         if self.client:
             try:
                 await self.client.logout()
             except Exception as e:
-                self.logger.error(f"Error during logout: {e}", exc_info=True)
+                self.logger.error("Error during logout: %s", e, exc_info=True)
             finally:
                 self.client = None
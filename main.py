@@ -16,14 +16,33 @@ IMAP_PORT = int(os.getenv("IMAP_PORT", 993))
 EMAIL_ADDRESS = os.getenv("EMAIL_ADDRESS")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
 MAILBOX = os.getenv("MAILBOX", "INBOX")
-CHECK_FREQUENCY = int(os.getenv("CHECK_FREQUENCY", 29))
+CHECK_FREQUENCY = int(os.getenv("CHECK_FREQUENCY", 10))
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+GREEN_API_SENDMESSAGE_URL = os.environ["GREEN_API_SENDMESSAGE_URL"]
+GREEN_API_SENDMESSAGE_TARGET = os.environ["GREEN_API_SENDMESSAGE_TARGET"]
 
 logging.basicConfig(
     level=LOG_LEVEL,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 
+_CODE_RE = re.compile(rb'<p style="font-size:20px;margin-top:15px;">(\d+)</p>')
+_TEMPLATE_MARKER = b"font-size:20px;margin-top:15px"
+_BASE64_RE = re.compile(rb"content-transfer-encoding:[ \t]*base64", re.IGNORECASE)
+_QP_RE = re.compile(rb"content-transfer-encoding:[ \t]*quoted-printable", re.IGNORECASE)
+_QP_SOFT_BREAK_RE = re.compile(rb"=\r?\n")
+
+_http: httpx.AsyncClient | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http
+    if _http is None:
+        _http = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60)
+        )
+    return _http
+
 
 async def main():
     listener = IMAPIdleListener(
@@ -33,8 +52,10 @@ async def main():
         password=EMAIL_PASSWORD,
         mailbox=MAILBOX,
         idle_timeout=CHECK_FREQUENCY * 60,
+        email_filter=is_verification_email,
     )
 
+    listener.add_raw_email_processor(forward_raw_verification_code)
     listener.add_email_processor(extract_verification_code)
 
     try:
@@ -42,43 +63,80 @@ async def main():
         await listener.connect()
         await listener.start_idle()
     except Exception as e:
-        logging.error(f"Error in main: {e}", exc_info=True)
+        logging.error("Error in main: %s", e, exc_info=True)
         await listener.stop()
+    finally:
+        if _http is not None:
+            await _http.aclose()
+
+
+def is_verification_email(raw_email: bytes) -> bool:
+    if _TEMPLATE_MARKER in raw_email:
+        return True
+    # The marker is not visible in a base64 body, so leave those to the MIME
+    # fallback. A quoted-printable soft line break may split it instead.
+    if _BASE64_RE.search(raw_email):
+        return True
+    if _QP_RE.search(raw_email):
+        return _TEMPLATE_MARKER in _QP_SOFT_BREAK_RE.sub(b"", raw_email)
+    return False
+
+
+async def forward_raw_verification_code(
+    raw_email: bytes, client: IMAPIdleListener
+) -> bool:
+    # Fast path for an unencoded template. Encoded templates that passed
+    # is_verification_email fall back to extract_verification_code.
+    code_match = _CODE_RE.search(raw_email)
+    if not code_match:
+        return False
+
+    await send_verification_code(code_match.group(1).decode())
+    return True
 
 
 async def extract_verification_code(email_message: Message, client: IMAPIdleListener):
     verification_code = None
     for part in email_message.walk():
-        content_type = part.get_content_type()
+        if part.is_multipart():
+            continue
 
-        if content_type == "text/html":
+        if part.get_content_type() == "text/html":
             payload = part.get_payload(decode=True)
             if payload and isinstance(payload, bytes):
-                html_content = payload.decode("utf-8")
-                code_match = re.search(
-                    r'<p style="font-size:20px;margin-top:15px;">(\d+)</p>',
-                    html_content,
-                )
+                code_match = _CODE_RE.search(payload)
                 if code_match:
-                    verification_code = code_match.group(1)
+                    verification_code = code_match.group(1).decode()
+                    break
 
     if verification_code:
-        async with httpx.AsyncClient() as http:
-            await http.post(
-                os.environ["GREEN_API_SENDMESSAGE_URL"],
-                json={
-                    "chatId": os.environ["GREEN_API_SENDMESSAGE_TARGET"],
-                    "message": f"{verification_code}",
-                },
-            )
+        await send_verification_code(verification_code)
+
+
+async def send_verification_code(verification_code: str) -> None:
+    await _get_http_client().post(
+        GREEN_API_SENDMESSAGE_URL,
+        json={
+            "chatId": GREEN_API_SENDMESSAGE_TARGET,
+            "message": f"{verification_code}",
+        },
+    )
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        import uvloop
+
+        loop_factory = uvloop.new_event_loop
+    except ImportError:
+        loop_factory = None
+
+    try:
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(main())
     except KeyboardInterrupt:
         logging.info("Keyboard interrupt received, exiting...")
     except Exception as e:
-        logging.error(f"Unexpected error: {e}", exc_info=True)
+        logging.error("Unexpected error: %s", e, exc_info=True)
     finally:
         logging.info("IMAP IDLE listener stopped")